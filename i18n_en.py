@@ -0,0 +1,62 @@
+"""English UI strings."""
+
+STRINGS = {
+    "app_title": "Digital Signature Generator/Signer (Non-certified) v0.0.1.0",
+    "pending_files": "Pending Files",
+    "add_files_btn": "Add Files",
+    "remove_selected_btn": "Remove Selected",
+    "clear_list_btn": "Clear List",
+    "cert_ts": "Certificate & Timestamp",
+    "pfx_file": "PFX File:",
+    "browse": "Browse…",
+    "password": "Password:",
+    "timestamp_server": "Timestamp Server:",
+    "create_self_signed_btn": "Create Self-signed PFX…",
+    "create_cer_btn": "Create CER certificate only",
+    "verify_btn": "Verify Signatures",
+    "sign_btn": "Sign + Timestamp",
+    "sign_no_ts_btn": "Sign (no timestamp)",
+    "timestamp_btn": "Timestamp Only",
+    "log_title": "Log",
+    "select_files_title": "Select Files",
+    "supported_formats": "Supported formats",
+    "all_files": "All files",
+    "added_files": "{n} file(s) added.",
+    "removed_selected": "Selected items removed.",
+    "list_cleared": "List cleared.",
+    "no_files": "Please add at least one file.",
+    "need_valid_pfx": "Please select a valid .pfx file first.",
+    "start_verify": "Verifying {n} file(s)…",
+    "verifying": "[{i}/{n}] Verify: {name}",
+    "result": "  Result: {status}",
+    "stats": "Verification summary:",
+    "trusted_friendly": "Trusted signature",
+    "self_signed_friendly": "Self-signed certificate (not CA-issued)",
+    "unsigned_friendly": "Unsigned (no certificate present)",
+    "invalid_friendly": "Invalid signature or certificate error",
+    "unknown_friendly": "Unknown status",
+    "signer": "Signer",
+    "issuer": "Issuer",
+    "timestamp": "Timestamp",
+    "signing": "[{i}/{n}] Sign: {name}",
+    "signing_no_index": "Sign: {name}",
+    "done": "  ✓ Done",
+    "sign_all_done": "All signatures completed.",
+    "start_timestamp": "Timestamping {n} file(s)…",
+    "timestamp_item": "[{i}/{n}] Timestamp: {name}",
+    "timestamp_done": "Timestamping completed.",
+    "create_self_signed": "Creating self-signed certificate…",
+    "self_signed_done": "Self-signed PFX created. A copy has been saved to Desktop: Key.pfx",
+    "self_signed_note": "Note: This is a self-signed certificate (not CA-issued).",
+    "create_pfx_failed": "Failed to create PFX.",
+    "create_cert_failed": "Failed to create certificate: {err}",
+    "drag_tip": "Drag and drop files into the list.",
+    "drag_not_available": "Drag-and-drop disabled: tkinterdnd2 not installed. Install with: pip install tkinterdnd2",
+    "concurrency": "Concurrency:",
+    "stats_item": "  {label}: {n}",
+    "concurrency_prompt": "You selected {n} files. Signing without timestamp will run concurrently (workers: {workers}). Continue?",
+    "seq_info_ts": "To avoid TSA rate limits, this operation runs sequentially.",
+    "cer_done": "CER certificate created and copied to Desktop: {name}",
+    "cer_not_found": "Generated CER file not found.",
+    "enter_pwd": "Enter PFX password ({name}):",
+}
@@ -0,0 +1,62 @@
+"""简体中文界面字符串。"""
+
+STRINGS = {
+    "app_title": "数字签名生成/签名程序(非认证) v0.0.1.0",
+    "pending_files": "待处理文件",
+    "add_files_btn": "添加文件",
+    "remove_selected_btn": "移除选中",
+    "clear_list_btn": "清空列表",
+    "cert_ts": "证书与时间戳",
+    "pfx_file": "PFX 文件:",
+    "browse": "浏览…",
+    "password": "密码:",
+    "timestamp_server": "时间戳服务器:",
+    "create_self_signed_btn": "创建自签名 PFX…",
+    "create_cer_btn": "仅创建安全证书 (.cer 文件)",
+    "verify_btn": "验证签名",
+    "sign_btn": "签名并加时间戳",
+    "sign_no_ts_btn": "签名（不加时间戳）",
+    "timestamp_btn": "仅添加时间戳",
+    "log_title": "日志",
+    "select_files_title": "选择文件",
+    "supported_formats": "支持的格式",
+    "all_files": "所有文件",
+    "added_files": "已添加 {n} 个文件。",
+    "removed_selected": "已移除选中项。",
+    "list_cleared": "列表已清空。",
+    "no_files": "请先添加至少一个文件。",
+    "need_valid_pfx": "请先选择有效的 .pfx 文件。",
+    "start_verify": "开始验证 {n} 个文件…",
+    "verifying": "[{i}/{n}] 验证：{name}",
+    "result": "  结果：{status}",
+    "stats": "验证完成。统计：",
+    "trusted_friendly": "受信任的签名",
+    "self_signed_friendly": "自签名证书（未经认证）",
+    "unsigned_friendly": "未签名（程序不存在证书）",
+    "invalid_friendly": "签名无效或证书错误",
+    "unknown_friendly": "未知状态",
+    "signer": "签名者",
+    "issuer": "颁发者",
+    "timestamp": "时间戳",
+    "signing": "[{i}/{n}] 签名：{name}",
+    "signing_no_index": "签名：{name}",
+    "done": "  ✓ 完成",
+    "sign_all_done": "全部签名完成。",
+    "start_timestamp": "开始为 {n} 个文件添加时间戳…",
+    "timestamp_item": "[{i}/{n}] 时间戳：{name}",
+    "timestamp_done": "时间戳添加完成。",
+    "create_self_signed": "开始创建自签名证书…",
+    "self_signed_done": "自签名 PFX 创建完成。桌面已保存副本：Key.pfx",
+    "self_signed_note": "注意：这是自签名证书，未经权威机构认证。",
+    "create_pfx_failed": "创建 PFX 失败。",
+    "create_cert_failed": "创建证书失败：{err}",
+    "drag_tip": "可将文件拖拽到列表中添加。",
+    "drag_not_available": "拖放功能不可用：未安装 tkinterdnd2。可通过 pip install tkinterdnd2 启用。",
+    "concurrency": "并发数:",
+    "stats_item": "  {label}：{n} 个",
+    "concurrency_prompt": "检测到选择了 {n} 个文件，将使用多线程（并发数：{workers}）进行签名（不加时间戳）。是否继续？",
+    "seq_info_ts": "为避免时间戳服务器限流，本操作将按顺序处理。",
+    "cer_done": "CER 证书已创建并复制到桌面：{name}",
+    "cer_not_found": "未找到生成的 CER 文件。",
+    "enter_pwd": "请输入 PFX 密码（{name}）：",
+}
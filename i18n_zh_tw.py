@@ -0,0 +1,62 @@
+"""繁體中文介面字串。"""
+
+STRINGS = {
+    "app_title": "數位簽章產生/簽署程式（非認證） v0.0.1.0",
+    "pending_files": "待處理檔案",
+    "add_files_btn": "新增檔案",
+    "remove_selected_btn": "移除選取",
+    "clear_list_btn": "清空列表",
+    "cert_ts": "憑證與時間戳",
+    "pfx_file": "PFX 檔案:",
+    "browse": "瀏覽…",
+    "password": "密碼:",
+    "timestamp_server": "時間戳伺服器:",
+    "create_self_signed_btn": "建立自簽名 PFX…",
+    "create_cer_btn": "僅建立安全憑證 (.cer 檔案)",
+    "verify_btn": "驗證簽名",
+    "sign_btn": "簽名並加時間戳",
+    "sign_no_ts_btn": "簽名（不加時間戳）",
+    "timestamp_btn": "僅新增時間戳",
+    "log_title": "日誌",
+    "select_files_title": "選擇檔案",
+    "supported_formats": "支援的格式",
+    "all_files": "所有檔案",
+    "added_files": "已新增 {n} 個檔案。",
+    "removed_selected": "已移除選取項。",
+    "list_cleared": "列表已清空。",
+    "no_files": "請先新增至少一個檔案。",
+    "need_valid_pfx": "請先選擇有效的 .pfx 檔案。",
+    "start_verify": "開始驗證 {n} 個檔案…",
+    "verifying": "[{i}/{n}] 驗證：{name}",
+    "result": "  結果：{status}",
+    "stats": "驗證完成。統計：",
+    "trusted_friendly": "受信任的簽名",
+    "self_signed_friendly": "自簽名憑證（未經認證）",
+    "unsigned_friendly": "未簽名（程式不存在憑證）",
+    "invalid_friendly": "簽名無效或憑證錯誤",
+    "unknown_friendly": "未知狀態",
+    "signer": "簽名者",
+    "issuer": "簽發者",
+    "timestamp": "時間戳",
+    "signing": "[{i}/{n}] 簽名：{name}",
+    "signing_no_index": "簽名：{name}",
+    "done": "  ✓ 完成",
+    "sign_all_done": "全部簽名完成。",
+    "start_timestamp": "開始為 {n} 個檔案新增時間戳…",
+    "timestamp_item": "[{i}/{n}] 時間戳：{name}",
+    "timestamp_done": "時間戳新增完成。",
+    "create_self_signed": "開始建立自簽名憑證…",
+    "self_signed_done": "自簽名 PFX 建立完成。桌面已保存副本：Key.pfx",
+    "self_signed_note": "注意：這是自簽名憑證，未經權威機構認證。",
+    "create_pfx_failed": "建立 PFX 失敗。",
+    "create_cert_failed": "建立憑證失敗：{err}",
+    "drag_tip": "可將檔案拖曳到列表中新增。",
+    "drag_not_available": "拖放功能不可用：未安裝 tkinterdnd2。可透過 pip install tkinterdnd2 啟用。",
+    "concurrency": "並發數:",
+    "stats_item": "  {label}：{n} 個",
+    "concurrency_prompt": "偵測到選取 {n} 個檔案，將以多執行緒（並發數：{workers}）進行簽名（不加時間戳）。是否繼續？",
+    "seq_info_ts": "為避免時間戳伺服器限流，本操作將按順序處理。",
+    "cer_done": "CER 憑證已建立並複製到桌面：{name}",
+    "cer_not_found": "找不到產生的 CER 檔案。",
+    "enter_pwd": "請輸入 PFX 密碼（{name}）：",
+}
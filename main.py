@@ -1,13 +1,20 @@
 import os
+import re
 import sys
-import glob
+import json
+import mmap
 import time
 import shutil
+import hashlib
+import tempfile
+import functools
+import subprocess
 import winreg
 from pathlib import Path
 from typing import Optional, Tuple, List
 from enum import Enum
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
 class Colors(Enum):
@@ -49,21 +56,25 @@ class FileFormats(Enum):
     @classmethod
     def get_all_extensions(cls) -> List[str]:
         """获取所有支持的扩展名"""
-        return [fmt.value for fmt in cls]
-    
+        return list(cls._EXT_TUPLE)
+
     @classmethod
     def is_supported(cls, file_path: str) -> bool:
         """检查文件是否为支持的格式"""
-        return any(file_path.lower().endswith(ext) for ext in cls.get_all_extensions())
-    
+        return file_path.lower().endswith(cls._EXT_TUPLE)
+
     @classmethod
     def get_format_description(cls) -> str:
         """获取格式描述字符串"""
-        formats = cls.get_all_extensions()
-        return f"({', '.join(formats)})"
+        return cls._FMT_DESC
+
 
+# 预计算扩展名元组与格式描述（枚举体内无法引用自身，故在类外赋值）
+FileFormats._EXT_TUPLE = tuple(fmt.value for fmt in FileFormats)
+FileFormats._FMT_DESC = f"({', '.join(FileFormats._EXT_TUPLE)})"
 
-@dataclass
+
+@dataclass(slots=True)
 class SigningConfig:
     """签名配置数据类"""
     name: str
@@ -72,7 +83,7 @@ class SigningConfig:
     pfx_path: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SignatureInfo:
     """签名信息数据类"""
     status: SignatureStatus
@@ -83,6 +94,72 @@ class SignatureInfo:
     error_message: Optional[str] = None
 
 
+# 签名字段行的单遍提取：一次 finditer 代替逐行多次子串检查
+_SIG_FIELD_RE = re.compile(
+    r'^\s*(Issued to|颁发给|Issued by|颁发者|Timestamped|Timestamp|时间戳)\s*:\s*(.*)$',
+    re.MULTILINE
+)
+_SIG_FIELD_MAP = {
+    'Issued to': 'signer_name',
+    '颁发给': 'signer_name',
+    'Issued by': 'issuer',
+    '颁发者': 'issuer',
+    'Timestamp': 'timestamp',
+    'Timestamped': 'timestamp',
+    '时间戳': 'timestamp',
+}
+
+
+# 受信任证书颁发机构关键字，合并为一个不区分大小写的正则交替式，单次 C 级扫描完成匹配
+_TRUSTED_CA_KEYWORDS = (
+    "Microsoft Corporation",
+    "Microsoft Code Signing",
+    "Microsoft Windows",
+    "Windows Verified Publisher",
+    "DigiCert",
+    "VeriSign",
+    "Symantec",
+    "GlobalSign",
+    "Sectigo",
+    "Comodo",
+    "Thawte",
+    "GeoTrust"
+)
+_TRUSTED_CA_RE = re.compile('|'.join(map(re.escape, _TRUSTED_CA_KEYWORDS)), re.IGNORECASE)
+
+# _parse_signature_info 的标志位：各子串只扫描一次，结果合入位掩码
+_F_NO_SIG = 1          # 未找到签名
+_F_UNTRUSTED_ROOT = 2  # 根证书不受信任（自签名）
+_F_TOOL_ERROR = 4      # SignTool 报错
+_F_ERROR_COUNT = 8     # 输出含错误统计行
+_F_VERIFIED = 16       # 验证成功标志
+
+
+# 子进程启动参数：抑制控制台窗口闪现并跳过 conhost 初始化（仅 Windows）
+if os.name == 'nt':
+    _STARTUPINFO = subprocess.STARTUPINFO(dwFlags=subprocess.STARTF_USESHOWWINDOW, wShowWindow=0)
+    _CREATIONFLAGS = subprocess.CREATE_NO_WINDOW
+else:
+    _STARTUPINFO = None
+    _CREATIONFLAGS = 0
+
+
+@functools.lru_cache(maxsize=1)
+def _desktop_path() -> str:
+    """获取桌面路径（每个进程只查询一次注册表）"""
+    key = winreg.OpenKey(winreg.HKEY_CURRENT_USER,
+                         r'Software\Microsoft\Windows\CurrentVersion\Explorer\Shell Folders')
+    return winreg.QueryValueEx(key, "Desktop")[0]
+
+
+def _verify_one(file_path: str) -> Tuple[str, str]:
+    """验证单个文件的签名（供线程池并发调用），返回 (文件路径, signtool 原始输出)"""
+    proc = subprocess.run(['signtool', 'verify', '/pa', '/v', file_path],
+                          capture_output=True, text=True,
+                          creationflags=_CREATIONFLAGS, startupinfo=_STARTUPINFO)
+    return file_path, proc.stdout + proc.stderr
+
+
 class DigitalSignatureTool:
     """数字签名工具主类"""
     
@@ -94,67 +171,174 @@ class DigitalSignatureTool:
         "http://timestamp.sectigo.com",
         "http://tsa.starfieldtech.com"
     ]
-    
+
     def __init__(self):
-        self.tools_path = self._get_resource_path("tools")
-        self.tools = {
-            'cert2spc': self._get_resource_path(os.path.join("tools", "cert2spc.exe")),
-            'makecert': self._get_resource_path(os.path.join("tools", "makecert.exe")),
-            'pvk2pfx': self._get_resource_path(os.path.join("tools", "pvk2pfx.exe")),
-            'signtool': self._get_resource_path(os.path.join("tools", "signtool.exe"))
-        }
-        self.desktop_path = self._get_desktop_path()
+        base = Path(sys._MEIPASS if getattr(sys, 'frozen', False) else '.').resolve()
+        self.tools_path = base / "tools"
+        self.tools = {name: self.tools_path / f"{name}.exe"
+                      for name in ('cert2spc', 'makecert', 'pvk2pfx', 'signtool')}
+        self.desktop_path = _desktop_path()
         self.current_timestamp_url = self.TIMESTAMP_URLS[0]
+        self._pool = None  # 惰性创建的线程池，跨菜单操作复用
+        # 验证结果缓存：按文件内容 SHA-256 记录上次结果，跨运行持久化
+        self._verify_cache_path = os.path.join(tempfile.gettempdir(), 'exefile_sigtool_verify.json')
+        self._verify_cache = self._load_verify_cache()
+        self._digest_memo = {}  # (路径, 大小, mtime) -> sha256，本次运行内避免重复哈希
+        # 主菜单文本只拼接一次（含颜色码），每次重绘仅写出
+        self._menu_head, self._menu_tail = self._build_menu_blocks()
+        self._menu_prompt = f'\n{Colors.BLUE.value}[光标]:{Colors.RESET.value}'
         
-    @staticmethod
-    def _get_resource_path(relative_path: str) -> str:
-        """获取资源路径（支持打包后的路径）"""
-        if getattr(sys, 'frozen', False):
-            base_path = sys._MEIPASS
-        else:
-            base_path = os.path.abspath(".")
-        return os.path.join(base_path, relative_path)
-    
-    @staticmethod
-    def _get_desktop_path() -> str:
-        """获取桌面路径"""
-        key = winreg.OpenKey(winreg.HKEY_CURRENT_USER,
-                             r'Software\Microsoft\Windows\CurrentVersion\Explorer\Shell Folders')
-        return winreg.QueryValueEx(key, "Desktop")[0]
-    
     def _clear_screen(self):
         """清屏"""
         os.system('cls' if os.name == 'nt' else 'clear')
     
+    # 批量验证的简要状态行，颜色码预拼接，热路径上零格式化
+    _BRIEF_STATUS_LINES = {
+        SignatureStatus.TRUSTED: f"{Colors.GREEN.value}✓ 受信任的签名{Colors.RESET.value}\n",
+        SignatureStatus.SELF_SIGNED: f"{Colors.YELLOW.value}⚠ 自签名{Colors.RESET.value}\n",
+        SignatureStatus.UNSIGNED: f"{Colors.RED.value}✗ 未签名{Colors.RESET.value}\n",
+        SignatureStatus.INVALID: f"{Colors.RED.value}✗ 签名无效{Colors.RESET.value}\n",
+        SignatureStatus.UNKNOWN: f"{Colors.CYAN.value}? 未知状态{Colors.RESET.value}\n"
+    }
+
     def _print_colored(self, text: str, color: Colors):
-        """打印带颜色的文本"""
-        print(f"{color.value}{text}{Colors.RESET.value}")
+        """打印带颜色的文本（单次 write 代替 print 的分段写出）"""
+        sys.stdout.write(f"{color.value}{text}{Colors.RESET.value}\n")
     
     def _check_tools(self) -> bool:
-        """检查必要的工具文件是否存在"""
-        if not os.path.exists(self.tools_path):
+        """检查必要的工具文件是否存在（单次目录扫描代替逐个 stat）"""
+        try:
+            present = {p.name.lower() for p in self.tools_path.iterdir()}
+        except OSError:
             self._print_colored(f"工具文件夹丢失:\nPATH: {{{self.tools_path}}}", Colors.RED)
             return False
-            
+
         for tool_name, tool_path in self.tools.items():
-            if not os.path.exists(tool_path):
+            if tool_path.name not in present:
                 self._print_colored(f"{tool_name}.exe文件丢失:\nPATH: {tool_path}", Colors.RED)
                 return False
-                
+
         os.chdir(self.tools_path)
         return True
     
-    def _execute_command(self, command: str) -> str:
-        """执行系统命令并返回输出"""
-        return os.popen(command).read()
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """获取持久线程池（首次使用时创建，之后各批量操作复用）"""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+        return self._pool
+
+    def _load_verify_cache(self) -> dict:
+        """读取持久化的验证结果缓存（损坏或不存在时返回空表）"""
+        try:
+            with open(self._verify_cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_verify_cache(self):
+        """持久化验证结果缓存（写入失败不影响退出）"""
+        try:
+            with open(self._verify_cache_path, 'w', encoding='utf-8') as f:
+                json.dump(self._verify_cache, f, ensure_ascii=False)
+        except OSError:
+            pass
+
+    def _hash_file(self, file_path: str) -> str:
+        """计算文件内容的 SHA-256（按 路径+大小+mtime 记忆，运行内不重复哈希）"""
+        st = os.stat(file_path)
+        key = (file_path, st.st_size, st.st_mtime_ns)
+        digest = self._digest_memo.get(key)
+        if digest is None:
+            if st.st_size == 0:
+                # mmap 不接受长度为 0 的映射，空文件直接哈希空串
+                digest = hashlib.sha256(b'').hexdigest()
+            elif hasattr(hashlib, 'file_digest'):  # Python 3.11+，零拷贝流式哈希
+                with open(file_path, 'rb', buffering=0) as f:
+                    digest = hashlib.file_digest(f, 'sha256').hexdigest()
+            else:
+                with open(file_path, 'rb') as f:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                        digest = hashlib.sha256(view).hexdigest()
+            self._digest_memo[key] = digest
+        return digest
+
+    def _cache_lookup(self, file_path: str, need_details: bool = False) -> Optional[SignatureInfo]:
+        """
+        按内容哈希查询验证结果缓存；未命中或文件不可读时返回 None。
+        need_details=True 时，批量快速验证写入的"仅状态"条目视为未命中，
+        以便详细视图重新执行 /v 获取签名者信息。
+        """
+        try:
+            size = os.path.getsize(file_path)
+            entry = self._verify_cache.get(self._hash_file(file_path))
+        except OSError:
+            return None
+        if not entry or entry.get('size') != size:
+            return None
+        if need_details and not entry.get('detailed', False):
+            return None
+        return SignatureInfo(
+            status=SignatureStatus(entry['status']),
+            signer_name=entry.get('signer_name'),
+            issuer=entry.get('issuer'),
+            timestamp=entry.get('timestamp'),
+            is_microsoft_signed=entry.get('is_microsoft_signed', False)
+        )
+
+    def _cache_store(self, file_path: str, info: SignatureInfo, detailed: bool = True):
+        """将验证结果写入缓存（文件不可读时静默跳过）；detailed=False 标记仅状态条目"""
+        try:
+            entry = {
+                'size': os.path.getsize(file_path),
+                'status': info.status.value,
+                'signer_name': info.signer_name,
+                'issuer': info.issuer,
+                'timestamp': info.timestamp,
+                'is_microsoft_signed': info.is_microsoft_signed,
+                'detailed': detailed
+            }
+            self._verify_cache[self._hash_file(file_path)] = entry
+        except OSError:
+            pass
+
+    def _verify_group(self, paths: List[str]) -> dict:
+        """
+        二分聚合验证：整组一次 /q 调用，退出码为 0 则全组受信任；
+        否则折半递归，最终只对确实失败的文件做详细 /v 解析。
+        返回 {文件路径: SignatureStatus}。
+        """
+        proc = subprocess.run(['signtool', 'verify', '/pa', '/q'] + paths,
+                              capture_output=True, text=True,
+                              creationflags=_CREATIONFLAGS, startupinfo=_STARTUPINFO)
+        if proc.returncode == 0:
+            for p in paths:
+                self._cache_store(p, SignatureInfo(status=SignatureStatus.TRUSTED), detailed=False)
+            return {p: SignatureStatus.TRUSTED for p in paths}
+
+        if len(paths) == 1:
+            _, raw = _verify_one(paths[0])
+            info = self._parse_signature_info(raw)
+            self._cache_store(paths[0], info)
+            return {paths[0]: info.status}
+
+        mid = len(paths) // 2
+        result = self._verify_group(paths[:mid])
+        result.update(self._verify_group(paths[mid:]))
+        return result
+
+    def _run(self, argv: List[str]) -> str:
+        """以参数列表方式执行外部工具并返回输出（不经 cmd.exe，免去二次解析与额外进程）"""
+        proc = subprocess.run(argv, capture_output=True, text=True, check=False,
+                              creationflags=_CREATIONFLAGS, startupinfo=_STARTUPINFO)
+        return proc.stdout + proc.stderr
     
     def _get_user_input(self, prompt: str, allow_empty: bool = True) -> str:
-        """获取用户输入"""
-        value = input(prompt).strip()
-        if not allow_empty and not value:
+        """获取用户输入（循环等待，避免空输入时递归加深栈）"""
+        while True:
+            value = input(prompt).strip()
+            if value or allow_empty:
+                return value
             self._print_colored("输入不能为空！", Colors.RED)
-            return self._get_user_input(prompt, allow_empty)
-        return value
     
     def _get_file_path(self, prompt: str, check_format: bool = True) -> str:
         """获取文件路径并验证"""
@@ -208,89 +392,62 @@ class DigitalSignatureTool:
     def _parse_signature_info(self, verify_output: str) -> SignatureInfo:
         """解析签名验证输出，获取详细信息"""
         info = SignatureInfo(status=SignatureStatus.UNKNOWN)
-        
-        # 检查是否未签名
+
+        # 一次性完成全部标志子串扫描，后续只在位掩码上分支
+        flags = 0
         if "SignTool Error: No signature found" in verify_output or "未找到签名" in verify_output:
+            flags |= _F_NO_SIG
+        if "terminated in a root certificate which is not trusted" in verify_output:
+            flags |= _F_UNTRUSTED_ROOT
+        if "SignTool Error" in verify_output:
+            flags |= _F_TOOL_ERROR
+        if "Number of errors" in verify_output:
+            flags |= _F_ERROR_COUNT
+        if ("Successfully verified" in verify_output
+                or "Number of files successfully Verified: 1" in verify_output):
+            flags |= _F_VERIFIED
+
+        # 检查是否未签名
+        if flags & _F_NO_SIG:
             info.status = SignatureStatus.UNSIGNED
             return info
-        
-        # 检查是否为自签名证书（根证书不受信任）
-        if "terminated in a root certificate which is not trusted" in verify_output:
+
+        # 检查是否为自签名证书（根证书不受信任，不将此作为错误）
+        if flags & _F_UNTRUSTED_ROOT:
             info.status = SignatureStatus.SELF_SIGNED
-            # 不将此作为错误
-        elif "SignTool Error" in verify_output and "Number of errors" not in verify_output:
+        elif (flags & _F_TOOL_ERROR) and not (flags & _F_ERROR_COUNT):
             # 其他类型的SignTool错误
             info.status = SignatureStatus.INVALID
             info.error_message = "签名验证失败"
-        
-        # 提取签名者信息
-        for line in verify_output.split('\n'):
-            line = line.strip()
-            if "Issued to:" in line or "颁发给:" in line:
-                info.signer_name = line.split(':', 1)[1].strip()
-            elif "Issued by:" in line or "颁发者:" in line:
-                info.issuer = line.split(':', 1)[1].strip()
-            elif "Timestamp:" in line or "时间戳:" in line or "Timestamped:" in line:
-                info.timestamp = line.split(':', 1)[1].strip()
-            elif "Signing Certificate Chain:" in line:
-                # 开始解析证书链
-                continue
-        
+
+        # 提取签名者信息（单遍正则扫描，字段行重复出现时保持"后者覆盖"的原语义）
+        for match in _SIG_FIELD_RE.finditer(verify_output):
+            setattr(info, _SIG_FIELD_MAP[match.group(1)], match.group(2).strip())
+
         # 如果已经确定是自签名，直接返回
         if info.status == SignatureStatus.SELF_SIGNED:
             return info
-        
-        # 判断是否为微软认证的签名
-        microsoft_keywords = [
-            "Microsoft Corporation",
-            "Microsoft Code Signing",
-            "Microsoft Windows",
-            "Windows Verified Publisher",
-            "DigiCert",
-            "VeriSign",
-            "Symantec",
-            "GlobalSign",
-            "Sectigo",
-            "Comodo",
-            "Thawte",
-            "GeoTrust"
-        ]
-        
+
         # 检查是否为受信任的证书颁发机构
-        if info.issuer:
-            for keyword in microsoft_keywords:
-                if keyword.lower() in info.issuer.lower():
-                    info.is_microsoft_signed = True
-                    break
-        
+        info.is_microsoft_signed = bool(info.issuer and _TRUSTED_CA_RE.search(info.issuer))
+
         # 判断最终签名状态
         if info.status == SignatureStatus.UNKNOWN:
-            if "Successfully verified" in verify_output:
+            if flags & _F_VERIFIED:
                 # 签名验证成功
-                if info.is_microsoft_signed:
-                    info.status = SignatureStatus.TRUSTED
-                else:
-                    info.status = SignatureStatus.TRUSTED
-            elif "Number of files successfully Verified: 1" in verify_output:
-                # 另一种成功验证的标志
-                if info.is_microsoft_signed:
-                    info.status = SignatureStatus.TRUSTED
-                else:
-                    info.status = SignatureStatus.TRUSTED
+                info.status = SignatureStatus.TRUSTED
+            elif info.signer_name and info.issuer:
+                # 有证书信息但未通过验证，按自签名处理
+                info.status = SignatureStatus.SELF_SIGNED
             else:
-                # 检查是否为自签名
-                if info.signer_name and info.issuer:
-                    if info.signer_name == info.issuer:
-                        info.status = SignatureStatus.SELF_SIGNED
-                    elif "Root Certificate" in verify_output or "root certificate" in verify_output:
-                        info.status = SignatureStatus.SELF_SIGNED
-                    else:
-                        info.status = SignatureStatus.SELF_SIGNED
-                else:
-                    info.status = SignatureStatus.INVALID
-                
+                info.status = SignatureStatus.INVALID
+
         return info
     
+    def _print_brief_status(self, status: SignatureStatus):
+        """打印批量验证时的单行简要状态（写出预拼接的彩色常量）"""
+        sys.stdout.write(self._BRIEF_STATUS_LINES.get(status, self._BRIEF_STATUS_LINES[SignatureStatus.UNKNOWN]))
+
     def _display_signature_status(self, info: SignatureInfo, file_name: str):
         """显示签名状态信息"""
         print(f"\n文件: {file_name}")
@@ -354,28 +511,51 @@ class DigitalSignatureTool:
                     SignatureStatus.UNKNOWN: 0
                 }
                 
-                for i, file_path in enumerate(files, 1):
-                    print(f"\n[{i}/{len(files)}] 正在验证: {os.path.basename(file_path)}")
-                    
-                    # 使用signtool verify命令，使用 /pa 参数允许任何证书
-                    verify_cmd = f'signtool verify /pa /v "{file_path}"'
-                    result = self._execute_command(verify_cmd)
-                    
-                    # 解析签名信息
-                    info = self._parse_signature_info(result)
-                    stats[info.status] += 1
-                    
-                    # 显示简要状态
-                    if info.status == SignatureStatus.TRUSTED:
-                        self._print_colored("✓ 受信任的签名", Colors.GREEN)
-                    elif info.status == SignatureStatus.SELF_SIGNED:
-                        self._print_colored("⚠ 自签名", Colors.YELLOW)
-                    elif info.status == SignatureStatus.UNSIGNED:
-                        self._print_colored("✗ 未签名", Colors.RED)
-                    elif info.status == SignatureStatus.INVALID:
-                        self._print_colored("✗ 签名无效", Colors.RED)
+                index = {f: i for i, f in enumerate(files, 1)}
+
+                def report(path: str, status: SignatureStatus):
+                    print(f"\n[{index[path]}/{len(files)}] 已验证: {os.path.basename(path)}")
+                    stats[status] += 1
+                    self._print_brief_status(status)
+
+                # 内容未变的文件直接复用缓存结果，完全跳过 signtool
+                uncached = []
+                for file_path in files:
+                    cached = self._cache_lookup(file_path)
+                    if cached is not None:
+                        report(file_path, cached.status)
                     else:
-                        self._print_colored("? 未知状态", Colors.CYAN)
+                        uncached.append(file_path)
+
+                if len(uncached) > 16:
+                    # 大批量：二分聚合验证，"全部有效"的常见场景只需少量进程调用
+                    for chunk in self._chunk_files(uncached):
+                        for file_path, status in self._verify_group(chunk).items():
+                            report(file_path, status)
+                else:
+                    # 第一遍：整批快速验证（不带 /v），一次进程调用覆盖多个文件；
+                    # 通过的直接计为受信任，常见的"全部有效"场景下无需逐文件详查
+                    passed = set()
+                    for chunk in self._chunk_files(uncached):
+                        result = self._run(['signtool', 'verify', '/pa'] + chunk)
+                        for line in result.split('\n'):
+                            if "Successfully verified" in line:
+                                passed.add(line.split(':', 1)[1].strip())
+
+                    for file_path in uncached:
+                        if file_path in passed:
+                            self._cache_store(file_path, SignatureInfo(status=SignatureStatus.TRUSTED),
+                                              detailed=False)
+                            report(file_path, SignatureStatus.TRUSTED)
+
+                    # 第二遍：仅对未通过快速验证的文件并发执行详细的 /v 验证
+                    pending = [f for f in uncached if f not in passed]
+                    futures = [self._get_pool().submit(_verify_one, f) for f in pending]
+                    for future in as_completed(futures):
+                        file_path, result = future.result()
+                        info = self._parse_signature_info(result)
+                        self._cache_store(file_path, info)
+                        report(file_path, info.status)
                 
                 # 显示统计信息
                 print("\n" + "=" * 60)
@@ -395,21 +575,27 @@ class DigitalSignatureTool:
             
             self._clear_screen()
             print(f"正在验证: {os.path.basename(file_path)}")
-            
-            # 使用signtool verify命令（使用 /pa 参数允许任何证书）
-            verify_cmd = f'signtool verify /pa /v "{file_path}"'
-            result = self._execute_command(verify_cmd)
-            
-            # 解析并显示签名信息
-            info = self._parse_signature_info(result)
+
+            # 内容未变时复用缓存结果，跳过 signtool；
+            # 批量快速验证留下的"仅状态"条目不满足详细视图，此处要求完整条目
+            info = self._cache_lookup(file_path, need_details=True)
+            result = None
+            if info is None:
+                # 使用signtool verify命令（使用 /pa 参数允许任何证书）
+                result = self._run(['signtool', 'verify', '/pa', '/v', file_path])
+
+                # 解析签名信息并写入缓存
+                info = self._parse_signature_info(result)
+                self._cache_store(file_path, info)
+
             self._display_signature_status(info, os.path.basename(file_path))
-            
+
             # 询问是否显示原始输出
             show_raw = self._get_user_input("\n是否显示详细的原始输出？(y/N): ").lower()
             if show_raw == 'y':
                 print("\n" + "=" * 60)
                 print("原始输出：")
-                print(result)
+                print(result if result is not None else "（结果来自缓存，无原始输出）")
         
         input("\n回车以返回主界面……")
     
@@ -435,13 +621,12 @@ class DigitalSignatureTool:
         # 构建makecert命令
         cn_part = f'CN={config.name}'
         email_part = f'EMAIL={config.email}' if config.email else ''
-        name_spec = f'"{cn_part}+{email_part}"' if email_part else f'"{cn_part}"'
-        
-        cmd = f'makecert -sv name.pvk -r -n {name_spec} name.cer'
-        self._execute_command(cmd)
-        
+        name_spec = f'{cn_part}+{email_part}' if email_part else cn_part
+
+        self._run(['makecert', '-sv', 'name.pvk', '-r', '-n', name_spec, 'name.cer'])
+
         # 转换为spc格式
-        self._execute_command("cert2spc name.cer name.spc")
+        self._run(['cert2spc', 'name.cer', 'name.spc'])
         return True
     
     def _create_pfx(self, password: Optional[str] = None) -> Tuple[bool, Optional[str]]:
@@ -451,12 +636,12 @@ class DigitalSignatureTool:
             if password is None:
                 password = self._get_user_input("请输入您刚才输入的密钥(如无则空着)：")
             
+            argv = ['pvk2pfx', '-pvk', 'name.pvk']
             if password:
-                cmd = f"pvk2pfx -pvk name.pvk -pi {password} -spc name.spc -pfx Key.pfx -f"
-            else:
-                cmd = "pvk2pfx -pvk name.pvk -spc name.spc -pfx Key.pfx -f"
-                
-            result = self._execute_command(cmd)
+                argv += ['-pi', password]
+            argv += ['-spc', 'name.spc', '-pfx', 'Key.pfx', '-f']
+
+            result = self._run(argv)
             
             if "ERROR: Password incorrect or PVK file corrupted." in result:
                 self._print_colored("密码错误！", Colors.RED)
@@ -467,53 +652,97 @@ class DigitalSignatureTool:
     
     def _cleanup_temp_files(self):
         """清理临时文件"""
-        temp_files = glob.glob("name.*")
-        for file in temp_files:
-            try:
-                os.remove(file)
-            except:
-                pass
+        with os.scandir('.') as it:
+            for entry in it:
+                if entry.name.startswith('name.') and entry.is_file():
+                    try:
+                        os.unlink(entry.path)
+                    except (FileNotFoundError, PermissionError):
+                        # 已被删除或被占用都可容忍；其余异常（含 Ctrl-C）照常上抛
+                        pass
     
     def _copy_to_desktop(self, filename: str):
-        """复制文件到桌面"""
-        desktop_file = os.path.join(self.desktop_path, filename)
+        """复制文件到桌面（可传绝对路径；目标名取 basename，不依赖当前工作目录）"""
+        name = os.path.basename(filename)
+        desktop_file = os.path.join(self.desktop_path, name)
         if os.path.exists(desktop_file):
             os.remove(desktop_file)
-        shutil.copy(filename, self.desktop_path)
-        print(f"{filename}文件已保存至桌面……")
+        shutil.copy(filename, desktop_file)
+        print(f"{name}文件已保存至桌面……")
     
+    @staticmethod
+    def _chunk_files(files: List[str], limit: int = 10000) -> List[List[str]]:
+        """按命令行总长度分组，保持在 Windows 约 32k 上限之下"""
+        chunks = []
+        chunk, length = [], 0
+        for f in files:
+            cost = len(f) + 3  # 引号 + 空格
+            if chunk and length + cost > limit:
+                chunks.append(chunk)
+                chunk, length = [], 0
+            chunk.append(f)
+            length += cost
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    @staticmethod
+    def _parse_signed_output(result: str) -> set:
+        """从 signtool 的汇总输出中提取成功处理的文件路径"""
+        ok = set()
+        for line in result.split('\n'):
+            if "Successfully signed" in line or "Successfully timestamped" in line:
+                ok.add(line.split(':', 1)[1].strip())
+        return ok
+
+    def _sign_files_batch(self, files: List[str], pfx_path: str, password: Optional[str] = None,
+                          add_timestamp: bool = True) -> dict:
+        """
+        批量签名：多个文件合并为一次 signtool 调用，摊薄进程启动开销。
+        返回 {文件路径: 是否成功}。
+        """
+        status = {}
+        for chunk in self._chunk_files(files):
+            argv = ['signtool', 'sign', '/f', pfx_path]
+            if password:
+                argv += ['/p', password]
+            result = self._run(argv + chunk)
+
+            if add_timestamp:
+                self._run(['signtool', 'timestamp', '/t', self.current_timestamp_url] + chunk)
+
+            signed = self._parse_signed_output(result)
+            all_ok = "Successfully" in result or "成功" in result
+            for p in chunk:
+                status[p] = p in signed or (all_ok and not signed)
+        return status
+
+    def _timestamp_files_batch(self, files: List[str]) -> dict:
+        """批量添加时间戳：多个文件合并为一次 signtool 调用。返回 {文件路径: 是否成功}"""
+        status = {}
+        for chunk in self._chunk_files(files):
+            result = self._run(['signtool', 'timestamp', '/t', self.current_timestamp_url] + chunk)
+            stamped = self._parse_signed_output(result)
+            all_ok = "Successfully" in result or "成功" in result
+            for p in chunk:
+                status[p] = p in stamped or (all_ok and not stamped)
+        return status
+
     def _sign_file(self, file_path: str, pfx_path: str, password: Optional[str] = None, add_timestamp: bool = True):
-        """执行签名操作"""
-        file_path = Path(file_path)
-        
-        # 处理路径中包含空格的情况
-        if ' ' in str(file_path):
-            original_cwd = os.getcwd()
-            os.chdir(file_path.parent)
-            temp_name = f"temp_sign{file_path.suffix}"
-            os.rename(file_path.name, temp_name)
-            
-            self._execute_sign_command(str(file_path.parent / temp_name), pfx_path, password, add_timestamp)
-            
-            os.rename(temp_name, file_path.name)
-            os.chdir(original_cwd)
-        else:
-            self._execute_sign_command(str(file_path), pfx_path, password, add_timestamp)
+        """执行签名操作（argv 方式调用 signtool，路径含空格亦可直接传入）"""
+        self._execute_sign_command(str(file_path), pfx_path, password, add_timestamp)
     
     def _execute_sign_command(self, file_path: str, pfx_path: str, password: Optional[str] = None, add_timestamp: bool = True):
         """执行实际的签名命令"""
         # 签名
+        argv = ['signtool', 'sign', '/f', pfx_path]
         if password:
-            sign_cmd = f'signtool sign /f "{pfx_path}" /p {password} "{file_path}"'
-        else:
-            sign_cmd = f'signtool sign /f "{pfx_path}" "{file_path}"'
-            
-        result = self._execute_command(sign_cmd)
-        
+            argv += ['/p', password]
+        result = self._run(argv + [file_path])
+
         # 添加时间戳
         if add_timestamp:
-            timestamp_cmd = f'signtool timestamp /t {self.current_timestamp_url} "{file_path}"'
-            self._execute_command(timestamp_cmd)
+            self._run(['signtool', 'timestamp', '/t', self.current_timestamp_url, file_path])
         
         return "Successfully" in result or "成功" in result
     
@@ -554,10 +783,13 @@ class DigitalSignatureTool:
                 if files:
                     self._clear_screen()
                     print(f"准备签名 {len(files)} 个文件...")
+                    status = self._sign_files_batch(files, "Key.pfx", password)
                     for i, file_path in enumerate(files, 1):
-                        print(f"\n[{i}/{len(files)}] 正在签名: {os.path.basename(file_path)}")
-                        self._sign_file(file_path, "Key.pfx", password)
-                        self._print_colored("✓ 完成", Colors.GREEN)
+                        name = os.path.basename(file_path)
+                        if status.get(file_path, False):
+                            self._print_colored(f"✓ [{i}/{len(files)}] {name}", Colors.GREEN)
+                        else:
+                            self._print_colored(f"✗ [{i}/{len(files)}] {name}", Colors.RED)
             else:
                 file_path = self._get_file_path(f"请将您所要签名的文件拖入窗口内 {FileFormats.get_format_description()}：")
                 self._sign_file(file_path, "Key.pfx", password)
@@ -596,10 +828,13 @@ class DigitalSignatureTool:
             if files:
                 self._clear_screen()
                 print(f"准备签名 {len(files)} 个文件...")
+                status = self._sign_files_batch(files, pfx_path, password)
                 for i, file_path in enumerate(files, 1):
-                    print(f"\n[{i}/{len(files)}] 正在签名: {os.path.basename(file_path)}")
-                    self._sign_file(file_path, pfx_path, password)
-                    self._print_colored("✓ 完成", Colors.GREEN)
+                    name = os.path.basename(file_path)
+                    if status.get(file_path, False):
+                        self._print_colored(f"✓ [{i}/{len(files)}] {name}", Colors.GREEN)
+                    else:
+                        self._print_colored(f"✗ [{i}/{len(files)}] {name}", Colors.RED)
         else:
             file_path = self._get_file_path(f"请将您所要签名的文件拖入窗口内 {FileFormats.get_format_description()}：")
             self._sign_file(file_path, pfx_path, password)
@@ -626,44 +861,17 @@ class DigitalSignatureTool:
             if files:
                 self._clear_screen()
                 print(f"准备为 {len(files)} 个文件添加时间戳...")
+                status = self._timestamp_files_batch(files)
                 for i, file_path in enumerate(files, 1):
-                    print(f"\n[{i}/{len(files)}] 正在处理: {os.path.basename(file_path)}")
-                    file_path_obj = Path(file_path)
-                    
-                    if ' ' in str(file_path_obj):
-                        original_cwd = os.getcwd()
-                        os.chdir(file_path_obj.parent)
-                        temp_name = f"temp_timestamp{file_path_obj.suffix}"
-                        os.rename(file_path_obj.name, temp_name)
-                        
-                        timestamp_cmd = f'signtool timestamp /t {self.current_timestamp_url} "{temp_name}"'
-                        self._execute_command(timestamp_cmd)
-                        
-                        os.rename(temp_name, file_path_obj.name)
-                        os.chdir(original_cwd)
+                    name = os.path.basename(file_path)
+                    if status.get(file_path, False):
+                        self._print_colored(f"✓ [{i}/{len(files)}] {name}", Colors.GREEN)
                     else:
-                        timestamp_cmd = f'signtool timestamp /t {self.current_timestamp_url} "{file_path}"'
-                        self._execute_command(timestamp_cmd)
-                    
-                    self._print_colored("✓ 完成", Colors.GREEN)
+                        self._print_colored(f"✗ [{i}/{len(files)}] {name}", Colors.RED)
         else:
             file_path = self._get_file_path(f"请将您所要添加时间戳的文件拖入窗口内 {FileFormats.get_format_description()}：")
-            
-            file_path_obj = Path(file_path)
-            if ' ' in str(file_path_obj):
-                original_cwd = os.getcwd()
-                os.chdir(file_path_obj.parent)
-                temp_name = f"temp_timestamp{file_path_obj.suffix}"
-                os.rename(file_path_obj.name, temp_name)
-                
-                timestamp_cmd = f'signtool timestamp /t {self.current_timestamp_url} "{temp_name}"'
-                self._execute_command(timestamp_cmd)
-                
-                os.rename(temp_name, file_path_obj.name)
-                os.chdir(original_cwd)
-            else:
-                timestamp_cmd = f'signtool timestamp /t {self.current_timestamp_url} "{file_path}"'
-                self._execute_command(timestamp_cmd)
+
+            self._run(['signtool', 'timestamp', '/t', self.current_timestamp_url, file_path])
         
         self._clear_screen()
         print("程序添加时间戳完成")
@@ -719,17 +927,18 @@ class DigitalSignatureTool:
     
     def option_exit(self):
         """选项8: 退出程序"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+        self._save_verify_cache()
         self._cleanup_temp_files()
         self._clear_screen()
         print("临时文件已清除！")
         sys.exit(0)
     
-    def show_menu(self):
-        """显示主菜单"""
-        self._clear_screen()
-        self._print_colored(f"{self.TITLE}\n", Colors.BLINK_GREEN)
-        self._print_colored("######主界面######\n", Colors.RED)
-        
+    def _build_menu_blocks(self) -> Tuple[str, str]:
+        """预生成主菜单文本（时间戳服务器行之前/之后两段，颜色码只拼接一次）"""
+        green, reset = Colors.GREEN.value, Colors.RESET.value
+
         menu_options = [
             "1、一键生成.pfx文件并为您所要签名的程序签名+添加时间戳",
             "2、将.pfx文件签名到您所要签名的程序+添加时间戳",
@@ -740,23 +949,33 @@ class DigitalSignatureTool:
             "7、验证文件签名",
             "8、清理临时文件并退出"
         ]
-        
-        self._print_colored("输入各选项前的数字以选择↓", Colors.GREEN)
-        for option in menu_options:
-            self._print_colored(option, Colors.GREEN)
-        
-        print(f"\n当前时间戳服务器: {self.current_timestamp_url}")
-        print(f"支持的文件格式: {FileFormats.get_format_description()}")
-        
-        # 显示签名状态说明
-        print("\n签名状态说明：")
-        self._print_colored("  ✓ 绿色 = 受信任的签名（权威机构认证）", Colors.GREEN)
-        self._print_colored("  ⚠ 黄色 = 自签名证书（未经认证）", Colors.YELLOW)
-        self._print_colored("  ✗ 红色 = 未签名或签名无效", Colors.RED)
-        
-        print(Colors.RESET.value)
-        
-        return self._get_user_input(f'\n{Colors.BLUE.value}[光标]:{Colors.RESET.value}')
+
+        head_lines = [
+            f"{Colors.BLINK_GREEN.value}{self.TITLE}\n{reset}",
+            f"{Colors.RED.value}######主界面######\n{reset}",
+            f"{green}输入各选项前的数字以选择↓{reset}"
+        ]
+        head_lines += [f"{green}{option}{reset}" for option in menu_options]
+        head = '\n'.join(head_lines) + '\n'
+
+        tail = (
+            f"支持的文件格式: {FileFormats.get_format_description()}\n"
+            "\n签名状态说明：\n"
+            f"{green}  ✓ 绿色 = 受信任的签名（权威机构认证）{reset}\n"
+            f"{Colors.YELLOW.value}  ⚠ 黄色 = 自签名证书（未经认证）{reset}\n"
+            f"{Colors.RED.value}  ✗ 红色 = 未签名或签名无效{reset}\n"
+            f"{reset}\n"
+        )
+        return head, tail
+
+    def show_menu(self):
+        """显示主菜单"""
+        self._clear_screen()
+        sys.stdout.write(self._menu_head)
+        sys.stdout.write(f"\n当前时间戳服务器: {self.current_timestamp_url}\n")
+        sys.stdout.write(self._menu_tail)
+
+        return self._get_user_input(self._menu_prompt)
     
     def run(self):
         """运行主程序"""